@@ -5,8 +5,39 @@ including the GameInfo bitfield and complete server entries.
 """
 
 from enum import IntEnum
-
-from pydantic import BaseModel, Field, computed_field
+from functools import cached_property
+
+from pydantic import BaseModel, ConfigDict, Field, computed_field
+
+# Known surface codes and their display names
+_SURFACE_DISPLAY = {
+    "BlueGreenCement": "Hard Court",
+    "Clay": "Clay Court",
+    "Grass": "Grass Court",
+    "Indoor": "Indoor Hard",
+    "Carpet": "Carpet",
+}
+# Surface keywords embedded in longer names, checked in order
+_SURFACE_KEYWORDS = (
+    ("clay", "Clay Court"),
+    ("grass", "Grass Court"),
+    ("indoor", "Indoor Hard"),
+    ("cement", "Hard Court"),
+    ("hard", "Hard Court"),
+)
+
+
+def _strip_numeric_prefix(name: str) -> str:
+    """Drop a leading tournament code, e.g. "0010 AO Rod Laver Night" -> "AO Rod Laver Night".
+
+    Equivalent to ``re.sub(r"^\\d+\\s+", "", name)`` without the regex.
+    """
+    if not name[:1].isdecimal():
+        return name
+    code = name.split(None, 1)[0]
+    if not code.isdecimal() or len(code) == len(name):
+        return name
+    return name[len(code):].lstrip()
 
 
 class PlayerConfig(IntEnum):
@@ -36,6 +67,11 @@ class ControlMode(IntEnum):
     MIXED = 3
 
 
+# Display names indexed by the raw PlayerConfig / NbSet field values
+_MODE_DISPLAY = ("Singles", "Unknown", "Comp Doubles", "Coop Doubles")
+_SETS_DISPLAY = ("Best of 1", "Best of 1", "Best of 3", "Best of 5")
+
+
 class GameInfo(BaseModel):
     """Parsed GameInfo bitfield from server data.
 
@@ -50,8 +86,12 @@ class GameInfo(BaseModel):
     - Bits 22-23: ControlMode (2 bits)
     - Bits 24-26: Preview (3 bits)
     - Bit 27: Tiredness (1 bit)
+
+    Frozen because the parser shares one instance per bitfield value.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     trial: int = Field(ge=0, le=3, description="Trial flag (2 bits)")
     player_config: PlayerConfig = Field(description="Game mode configuration")
     nb_set: int = Field(ge=0, le=3, description="Number of sets configuration")
@@ -65,12 +105,7 @@ class GameInfo(BaseModel):
     @property
     def mode_display(self) -> str:
         """Human-readable game mode."""
-        mode_names = {
-            PlayerConfig.SINGLES: "Singles",
-            PlayerConfig.COMPETITIVE_DOUBLES: "Comp Doubles",
-            PlayerConfig.COOPERATIVE_DOUBLES: "Coop Doubles",
-        }
-        return mode_names.get(self.player_config, "Unknown")
+        return _MODE_DISPLAY[self.player_config]
 
     @computed_field
     @property
@@ -84,8 +119,7 @@ class GameInfo(BaseModel):
         - 2: Best of 3 (first to 2 sets)
         - 3: Best of 5 (first to 3 sets)
         """
-        set_map = {0: "Best of 1", 1: "Best of 1", 2: "Best of 3", 3: "Best of 5"}
-        return set_map.get(self.nb_set, f"Best of {self.nb_set}")
+        return _SETS_DISPLAY[self.nb_set]
 
 
 class GameServer(BaseModel):
@@ -121,6 +155,20 @@ class GameServer(BaseModel):
             return (parts[0].strip(), parts[1].strip())
         return (self.match_name, "Unknown")
 
+    @cached_property
+    def norm_players(self) -> frozenset[str]:
+        """Lower-cased player names, excluding the "Unknown" placeholder.
+
+        Cached per instance so rename detection can compare servers with
+        plain set operations.
+        """
+        return frozenset(n.lower().strip() for n in self.player_names if n != "Unknown")
+
+    @cached_property
+    def is_waiting(self) -> bool:
+        """True if the server is still waiting for an opponent."""
+        return not self.norm_players or "waiting" in self.norm_players
+
     @computed_field
     @property
     def match_id(self) -> str:
@@ -146,37 +194,22 @@ class GameServer(BaseModel):
         - Actual surface types: "BlueGreenCement", "Clay", "Grass", "Indoor"
         - Tournament names with codes: "0010 AO Rod Laver Night"
         """
-        import re
-
         name = self.surface_name.strip()
 
-        # Map known surface codes to display names
-        surface_map = {
-            "BlueGreenCement": "Hard Court",
-            "Clay": "Clay Court",
-            "Grass": "Grass Court",
-            "Indoor": "Indoor Hard",
-            "Carpet": "Carpet",
-        }
-
         # Check if it's a known surface type
-        if name in surface_map:
-            return surface_map[name]
+        display = _SURFACE_DISPLAY.get(name)
+        if display is not None:
+            return display
 
         # Check if surface type is embedded in the name
         name_lower = name.lower()
-        if "clay" in name_lower:
-            return "Clay Court"
-        if "grass" in name_lower:
-            return "Grass Court"
-        if "indoor" in name_lower:
-            return "Indoor Hard"
-        if "cement" in name_lower or "hard" in name_lower:
-            return "Hard Court"
+        for keyword, display in _SURFACE_KEYWORDS:
+            if keyword in name_lower:
+                return display
 
         # For tournament names (like "0010 AO Rod Laver Night"), return generic
         # based on tournament context
-        if re.match(r"^\d+\s+", name):
+        if _strip_numeric_prefix(name) != name:
             # Has numeric prefix - it's a tournament name, try to infer surface
             if "AO" in name or "Australian" in name:
                 return "Hard Court"  # Australian Open is hard court
@@ -199,20 +232,17 @@ class GameServer(BaseModel):
         Cleans up tournament names by removing numeric prefix codes.
         E.g., "0010 AO Rod Laver Night" -> "AO Rod Laver Night"
         """
-        import re
-
         name = self.surface_name.strip()
 
         # Known surface types are not tournament names
-        known_surfaces = {"BlueGreenCement", "Clay", "Grass", "Indoor", "Carpet"}
-        if name in known_surfaces:
+        if name in _SURFACE_DISPLAY:
             return ""
 
         # Remove numeric prefix (e.g., "0010 " or "00031 ")
-        cleaned = re.sub(r"^\d+\s+", "", name)
+        cleaned = _strip_numeric_prefix(name)
 
         # If the name is just a surface type after cleaning, return empty
-        if cleaned in known_surfaces:
+        if cleaned in _SURFACE_DISPLAY:
             return ""
 
         return cleaned if cleaned != name else name
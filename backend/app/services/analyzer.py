@@ -4,10 +4,14 @@ This module handles parsing of Tennis Elbow 4 match log HTML files
 and extracts detailed statistics for both players.
 """
 
+import asyncio
 import re
+from collections.abc import Iterable
 from datetime import datetime
+from functools import lru_cache
 
-from bs4 import BeautifulSoup
+from lxml import etree
+from lxml.html import HtmlElement, HTMLParser, document_fromstring
 
 from app.core.logging import get_logger
 from app.models.match_stats import (
@@ -23,60 +27,115 @@ from app.models.match_stats import (
 
 logger = get_logger("analyzer")
 
+# Patterns used per stats cell / per file, compiled once at import
+_RATIO_RE = re.compile(r"(\d+)\s*/\s*(\d+)")
+_PCT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+_NUM_RE = re.compile(r"(\d+)")
+_ELO_VALUE_RE = re.compile(r"(\d+)(?:\s*([+-]\d+))?")
+# "(ELO: ...)" block in a player name; the class stops at the first ")"
+_ELO_BLOCK_RE = re.compile(r"\s*\(ELO:[^)\n]*\)")
+_DOC_END_RE = re.compile(r"</(?:body|html)\s*>", re.IGNORECASE)
+
+
+# Text that marks a match header
+# EN: "def.", FR: "bat.", ES: "vs", PL: "Przegrana"
+_MATCH_SEPARATORS = (" def. ", " bat. ", " vs ", " Przegrana ")
+_MATCH_SEPARATOR_BYTES = tuple(sep.encode() for sep in _MATCH_SEPARATORS)
+
+# Header patterns, compiled once rather than per candidate paragraph
+# Separator regex: handles EN/FR/ES/PL separators
+_SEP_PATTERN = r"(?: def\. | bat\. | vs | Przegrana )"
+# Strict Pattern (User Hint): (.*?) \(ELO: ...\) [sep] (.*?) \(ELO: ...\) : (.*?) - (.*?) - (.*?) - (.*)
+# ELO values stop at the first ")" and are possessive, so they never backtrack
+_STRICT_HEADER_RE = re.compile(
+    r"(.*?) \(ELO: ([^)]*+)\)" + _SEP_PATTERN + r"(.*?) \(ELO: ([^)]*+)\)\s*:\s*(.*?) - (.*?) - (.*?) - (.*)"
+)
+# Fallback Pattern
+_FALLBACK_HEADER_RE = re.compile(
+    r"(.*?)" + _SEP_PATTERN + r"(.*?)\s*:\s*(.*?) - (.*?) - (.*?) - (.*)"
+)
+# ELO embedded in a name on the fallback paths: "Name (ELO: 1234 ...)"
+_ELO_IN_NAME_RE = re.compile(r"\(ELO:\s*(\d+)")
+# Duration with real time: "1:45:00 (2:30:00)"
+_DURATION_RE = re.compile(r"([\d:\']+)\s*\(([\d:\']+)\)")
 
-def parse_ratio(text: str) -> tuple[int, int, float]:
-    """Parse a ratio string like '41 / 66 = 62%' into components.
 
-    Also handles '62% (41/66)' and simple '41/66'.
+@lru_cache(maxsize=8192)
+def parse_ratio_counts(text: str) -> tuple[int, int]:
+    """Parse only the counts of a ratio string like '41 / 66 = 62%'.
+
+    Also handles '62% (41/66)' and simple '41/66'. Never looks at the
+    percentage unless it is the only number in the cell.
 
     Args:
         text: Ratio string from the stats table.
 
     Returns:
-        Tuple of (numerator, denominator, percentage).
+        Tuple of (numerator, denominator).
     """
     text = text.strip()
     if not text:
-        return (0, 0, 0.0)
+        return (0, 0)
+
+    # Fast paths for the two shapes TE4 actually writes: "6" and "41 / 66 = 62%".
+    # Plain str checks; anything else goes through the regex strategies below.
+    if text.isdecimal():
+        return (int(text), 0)
+    num_str, sep, rest = text.partition(" / ")
+    if sep and num_str.isdecimal():
+        denom_str, sep, _ = rest.partition(" = ")
+        if sep and denom_str.isdecimal():
+            return (int(num_str), int(denom_str))
 
     # Strategy 1: Look for the Ratio "X / Y" explicitly
     # This covers "X / Y = Z%", "Z% (X / Y)", and just "X / Y"
     # We prioritize finding the ratio because that gives us the raw counts
-    ratio_match = re.search(r"(\d+)\s*/\s*(\d+)", text)
+    ratio_match = _RATIO_RE.search(text)
     if ratio_match:
-        num = int(ratio_match.group(1))
-        denom = int(ratio_match.group(2))
-        
-        # Try to find percentage in the same string to be precise, otherwise calculate it
-        # Handle 100% specially to avoid issues
-        if num == denom and num > 0:
-            pct = 100.0
-        else:
-            pct_match = re.search(r"(\d+(?:\.\d+)?)\s*%", text)
-            if pct_match:
-                pct = float(pct_match.group(1))
-            else:
-                pct = (num / denom * 100) if denom > 0 else 0.0
-            
-        return (num, denom, pct)
+        return (int(ratio_match.group(1)), int(ratio_match.group(2)))
 
     # Strategy 2: If no ratio found, look for just a percentage "62%"
     # We treat this as "62/0" which is not ideal but preserves the data
-    pct_match = re.search(r"(\d+(?:\.\d+)?)\s*%", text)
+    pct_match = _PCT_RE.search(text)
     if pct_match:
-        pct = float(pct_match.group(1))
-        return (int(pct), 0, pct)
+        return (int(float(pct_match.group(1))), 0)
 
     # Strategy 3: Try just a number "62"
     # match() is fine here as we want to ensure it's the main content if nothing else matched
     # But text might be "226 Km/h", so we look for \d+
-    val_match = re.match(r"(\d+)", text)
+    val_match = _NUM_RE.match(text)
     if val_match:
-        return (int(val_match.group(1)), 0, 0.0)
+        return (int(val_match.group(1)), 0)
+
+    return (0, 0)
+
 
-    return (0, 0, 0.0)
+@lru_cache(maxsize=8192)
+def parse_ratio(text: str) -> tuple[int, int, float]:
+    """Parse a ratio string like '41 / 66 = 62%' into components.
 
+    Counts come from parse_ratio_counts; only the percentage is found here.
 
+    Args:
+        text: Ratio string from the stats table.
+
+    Returns:
+        Tuple of (numerator, denominator, percentage).
+    """
+    num, denom = parse_ratio_counts(text)
+
+    # Handle 100% specially to avoid issues
+    if denom and num == denom:
+        return (num, denom, 100.0)
+
+    # Try to find percentage in the same string to be precise, otherwise calculate it
+    pct_match = _PCT_RE.search(text)
+    if pct_match:
+        return (num, denom, float(pct_match.group(1)))
+    return (num, denom, (num / denom * 100) if denom > 0 else 0.0)
+
+
+@lru_cache(maxsize=8192)
 def parse_speed(text: str) -> float:
     """Parse a speed value like '222 Km/h'.
 
@@ -109,49 +168,34 @@ def parse_duration(duration_str: str) -> str:
         return duration_str
 
 
-def extract_header_info(soup: BeautifulSoup) -> MatchInfo | None:
-    """Extract match information from the HTML header.
+def extract_header_from_paragraphs(paragraphs: Iterable[HtmlElement]) -> MatchInfo | None:
+    """Extract match information from the first matching header paragraph.
 
     Expected formats:
     1. STRICT: "Player1 (ELO: ...) def. Player2 (ELO: ...) : Score - Tournament - Duration (Real) - Date [Online]"
     2. CPU/Other: "Player1 def. Player2 : Score - Tournament - Duration (Real) - Date"
 
     Args:
-        soup: BeautifulSoup object of the HTML.
+        paragraphs: <p> elements in document order.
 
     Returns:
         MatchInfo model or None if parsing fails.
     """
     try:
         # Find paragraphs that contain match info
-        for p in soup.find_all("p"):
-            text = p.get_text().strip()
+        for p in paragraphs:
+            text = p.text_content().strip()
 
             # Trigger: Look for <p> tags that contain match separators
-            # EN: "def.", FR: "bat.", ES: "vs", PL: "Przegrana"
-            separators = [" def. ", " bat. ", " vs ", " Przegrana "]
-            if not any(sep in text for sep in separators):
+            # (plain substring checks, far cheaper than running the patterns)
+            if not any(sep in text for sep in _MATCH_SEPARATORS):
                 continue
 
             logger.debug(f"Found header candidate: {text[:100]}")
 
-            # Define Regex Patterns
-            
-            # Separator regex: handles EN/FR/ES/PL separators
-            sep_pattern = r"(?: def\. | bat\. | vs | Przegrana )"
-            
-            # Strict Pattern (User Hint): (.*?) \(ELO: (.*?)\) [sep] (.*?) \(ELO: (.*?)\) : (.*?) - (.*?) - (.*?) - (.*)
-            strict_pattern = re.compile(
-                r"(.*?) \(ELO: (.*?)\)" + sep_pattern + r"(.*?) \(ELO: (.*?)\)\s*:\s*(.*?) - (.*?) - (.*?) - (.*)"
-            )
-            
-            # Fallback Pattern
-            fallback_pattern = re.compile(
-                r"(.*?)" + sep_pattern + r"(.*?)\s*:\s*(.*?) - (.*?) - (.*?) - (.*)"
-            )
-
-            # Try Strict Match First
-            match = strict_pattern.match(text)
+            # Try Strict Match First; it needs the literal ELO blocks, so
+            # headers without them (CPU, doubles) skip the regex entirely
+            match = _STRICT_HEADER_RE.match(text) if " (ELO: " in text else None
             if match:
                 groups = match.groups()
                 # Groups: 
@@ -177,7 +221,7 @@ def extract_header_info(soup: BeautifulSoup) -> MatchInfo | None:
                 
                 # Check for ELO in group 2 and 4 from strict match
                 if groups[1] and groups[1].strip():
-                    m = re.match(r"(\d+)(?:\s*([+-]\d+))?", groups[1].strip())
+                    m = _ELO_VALUE_RE.match(groups[1].strip())
                     if m:
                         try:
                             p1_elo_val = int(m.group(1))
@@ -188,7 +232,7 @@ def extract_header_info(soup: BeautifulSoup) -> MatchInfo | None:
                             pass
                 
                 if groups[3] and groups[3].strip():
-                    m = re.match(r"(\d+)(?:\s*([+-]\d+))?", groups[3].strip())
+                    m = _ELO_VALUE_RE.match(groups[3].strip())
                     if m:
                         try:
                             p2_elo_val = int(m.group(1))
@@ -200,7 +244,7 @@ def extract_header_info(soup: BeautifulSoup) -> MatchInfo | None:
                         
             else:
                 # Try Fallback
-                match = fallback_pattern.match(text)
+                match = _FALLBACK_HEADER_RE.match(text)
                 p1_elo_val = None
                 p2_elo_val = None
                 p1_diff_val = None
@@ -213,14 +257,14 @@ def extract_header_info(soup: BeautifulSoup) -> MatchInfo | None:
                     raw_p2 = groups[1].strip()
                     
                     # Extract ELO from names if present: "Name (ELO: 1234 ...)"
-                    p1_elo_match = re.search(r"\(ELO:\s*(\d+)", raw_p1)
+                    p1_elo_match = _ELO_IN_NAME_RE.search(raw_p1)
                     if p1_elo_match:
                          try:
                              p1_elo_val = int(p1_elo_match.group(1))
                          except ValueError:
                              pass
                     
-                    p2_elo_match = re.search(r"\(ELO:\s*(\d+)", raw_p2)
+                    p2_elo_match = _ELO_IN_NAME_RE.search(raw_p2)
                     if p2_elo_match:
                          try:
                              p2_elo_val = int(p2_elo_match.group(1))
@@ -228,8 +272,8 @@ def extract_header_info(soup: BeautifulSoup) -> MatchInfo | None:
                              pass
 
                     # Clean names: remove (ELO: ...) block entirely
-                    player1_name = re.sub(r"\s*\(ELO:.*?\)", "", raw_p1).strip()
-                    player2_name = re.sub(r"\s*\(ELO:.*?\)", "", raw_p2).strip()
+                    player1_name = _ELO_BLOCK_RE.sub("", raw_p1).strip()
+                    player2_name = _ELO_BLOCK_RE.sub("", raw_p2).strip()
                     
                     score = groups[2].strip()
                     tournament = groups[3].strip()
@@ -252,14 +296,14 @@ def extract_header_info(soup: BeautifulSoup) -> MatchInfo | None:
                     # Handle checkbox garbage matching
                     raw_p1 = re.sub(r"^.*?([A-Za-z])", r"\1", raw_p1) 
                     
-                    p1_elo_match = re.search(r"\(ELO:\s*(\d+)", raw_p1)
+                    p1_elo_match = _ELO_IN_NAME_RE.search(raw_p1)
                     if p1_elo_match:
                          try:
                              p1_elo_val = int(p1_elo_match.group(1))
                          except ValueError:
                              pass
                              
-                    player1_name = re.sub(r"\s*\(ELO:.*?\)", "", raw_p1).strip()
+                    player1_name = _ELO_BLOCK_RE.sub("", raw_p1).strip()
 
                     rest = parts[1].strip()
                     
@@ -271,14 +315,14 @@ def extract_header_info(soup: BeautifulSoup) -> MatchInfo | None:
                         raw_p2 = rest[:start].strip()
                         details = rest[end:].strip()
                         
-                        p2_elo_match = re.search(r"\(ELO:\s*(\d+)", raw_p2)
+                        p2_elo_match = _ELO_IN_NAME_RE.search(raw_p2)
                         if p2_elo_match:
                              try:
                                  p2_elo_val = int(p2_elo_match.group(1))
                              except ValueError:
                                  pass
                                  
-                        player2_name = re.sub(r"\s*\(ELO:.*?\)", "", raw_p2).strip()
+                        player2_name = _ELO_BLOCK_RE.sub("", raw_p2).strip()
                         
                         detail_parts = [x.strip() for x in details.split(" - ")]
                         score = detail_parts[0] if len(detail_parts) > 0 else ""
@@ -297,7 +341,7 @@ def extract_header_info(soup: BeautifulSoup) -> MatchInfo | None:
             # Parse Duration
             duration = ""
             real_duration = ""
-            dur_match = re.match(r"([\d:\']+)\s*\(([\d:\']+)\)", duration_part)
+            dur_match = _DURATION_RE.match(duration_part)
             if dur_match:
                 duration = dur_match.group(1)
                 real_duration = dur_match.group(2)
@@ -317,7 +361,8 @@ def extract_header_info(soup: BeautifulSoup) -> MatchInfo | None:
                         pass
             
             # Check for Retirement ("ret." used in EN/ES/FR, "ab." for abandon)
-            is_retirement = "ret." in score.lower() or "ab." in score.lower()
+            score_lower = score.lower()
+            is_retirement = "ret." in score_lower or "ab." in score_lower
 
             return MatchInfo(
                 player1_name=player1_name,
@@ -343,8 +388,8 @@ def extract_header_info(soup: BeautifulSoup) -> MatchInfo | None:
 
 StatsRow = dict[str, str | None]
 
-def extract_stats_from_table(soup: BeautifulSoup) -> list[StatsRow]:
-    """Extract statistics from the HTML table by position.
+def extract_stats_from_tables(tables: Iterable[HtmlElement]) -> list[StatsRow]:
+    """Extract statistics from the first stats table by position.
 
     The TE4 table format has 6 or 7 columns per row.
     We extract rows into a structured list where each row has:
@@ -352,7 +397,7 @@ def extract_stats_from_table(soup: BeautifulSoup) -> list[StatsRow]:
     - right_p1, right_label, right_p2 (optional)
 
     Args:
-        soup: BeautifulSoup object of the HTML.
+        tables: <table> elements in document order.
 
     Returns:
         List of dictionaries containing row data.
@@ -363,21 +408,22 @@ def extract_stats_from_table(soup: BeautifulSoup) -> list[StatsRow]:
     # The file might have multiple tables if checkboxes are present, 
     # but usually the stats are in the table following the header.
     # We iterate all tables and look for the one with stats structure.
-    tables = soup.find_all("table")
-
     for table in tables:
-        rows = table.find_all("tr")
+        rows = table.iter("tr")
         current_table_rows: list[StatsRow] = []
+        add_row = current_table_rows.append  # bound once for the row loop
         is_valid_stats_table = False
 
         for row in rows:
-            cells = row.find_all("td")
+            cells = row.findall(".//td")
             if len(cells) >= 3:
+                # One text extraction per cell, reused for every field below
+                texts = [cell.text_content().strip() for cell in cells]
                 # Basic row structure
                 row_item: StatsRow = {
-                    "left_p1": cells[0].get_text().strip(),
-                    "left_p2": cells[2].get_text().strip(),
-                    "left_label": cells[1].get_text().strip(),
+                    "left_p1": texts[0],
+                    "left_p2": texts[2],
+                    "left_label": texts[1],
                     "right_p1": None,
                     "right_p2": None,
                     "right_label": None,
@@ -385,17 +431,17 @@ def extract_stats_from_table(soup: BeautifulSoup) -> list[StatsRow]:
                 
                 # Check for second group (columns 4, 5, 6)
                 # cell 3 is spacer
-                if len(cells) >= 7:
-                     row_item["right_p1"] = cells[4].get_text().strip()
-                     row_item["right_label"] = cells[5].get_text().strip()
-                     row_item["right_p2"] = cells[6].get_text().strip()
+                if len(texts) >= 7:
+                     row_item["right_p1"] = texts[4]
+                     row_item["right_label"] = texts[5]
+                     row_item["right_p2"] = texts[6]
                 
-                current_table_rows.append(row_item)
+                add_row(row_item)
                 
                 # Heuristic to identify this as the stats table:
                 # Look for known percentage signs or '/' in values, or specific structure length
-                p1_val = row_item["left_p1"]
-                if "/" in str(p1_val) or "%" in str(p1_val):
+                p1_val = texts[0]
+                if "/" in p1_val or "%" in p1_val:
                     is_valid_stats_table = True
 
         if is_valid_stats_table and len(current_table_rows) >= 10:
@@ -478,13 +524,14 @@ def build_player_stats(
 
     # Parse serve stats
     # Row 0 Left: 1st Serve %
+    # Only row that needs the percentage as well as the counts
     first_serve = parse_ratio(val(0, "left"))
     
     # Row 1 Left: Aces
-    aces = parse_ratio(val(1, "left"))[0]
+    aces = parse_ratio_counts(val(1, "left"))[0]
     
     # Row 2 Left: Double Faults
-    dfs = parse_ratio(val(2, "left"))[0]
+    dfs = parse_ratio_counts(val(2, "left"))[0]
     
     # Row 3 Left: Fastest Serve
     fastest = parse_speed(val(3, "left"))
@@ -508,11 +555,11 @@ def build_player_stats(
 
     # Parse rally stats
     # Row 0 Right: Short Rallies
-    short_rallies = parse_ratio(val(0, "right"))
+    short_rallies = parse_ratio_counts(val(0, "right"))
     # Row 1 Right: Medium Rallies
-    normal_rallies = parse_ratio(val(1, "right"))
+    normal_rallies = parse_ratio_counts(val(1, "right"))
     # Row 2 Right: Long Rallies
-    long_rallies = parse_ratio(val(2, "right"))
+    long_rallies = parse_ratio_counts(val(2, "right"))
     # Row 3 Right: Avg Rally Length (Extracted from label, shared for both players usually, but logic is generic)
     avg_rally = extract_rally_length(rows)
 
@@ -528,30 +575,30 @@ def build_player_stats(
 
     # Parse point stats
     # Row 6 Left: Winners
-    winners = parse_ratio(val(6, "left"))[0]
+    winners = parse_ratio_counts(val(6, "left"))[0]
     # Row 7 Left: Forced Errors
-    forced = parse_ratio(val(7, "left"))[0]
+    forced = parse_ratio_counts(val(7, "left"))[0]
     # Row 8 Left: Unforced Errors
-    unforced = parse_ratio(val(8, "left"))[0]
+    unforced = parse_ratio_counts(val(8, "left"))[0]
     
     # Row 9 Left: Net Points Won
-    net_pts = parse_ratio(val(9, "left"))
+    net_pts = parse_ratio_counts(val(9, "left"))
     
     # Row 6 Right: 1st Serve Won %
-    first_won = parse_ratio(val(6, "right"))
+    first_won = parse_ratio_counts(val(6, "right"))
     # Row 7 Right: 2nd Serve Won %
-    second_won = parse_ratio(val(7, "right"))
+    second_won = parse_ratio_counts(val(7, "right"))
     
     # Row 8 Right: Return Points Won
-    ret_pts = parse_ratio(val(8, "right"))
+    ret_pts = parse_ratio_counts(val(8, "right"))
     
     # Row 9 Right: Return Winners
     ret_winners_val = val(9, "right")
     # Sometimes Row 9 Right is empty or diff? English says "RETURN WINNERS" at Row 9 Right
-    ret_winners = parse_ratio(ret_winners_val)[0]
+    ret_winners = parse_ratio_counts(ret_winners_val)[0]
     
     # Row 11 Left: Total Points Won
-    total_won = parse_ratio(val(11, "left"))[0]
+    total_won = parse_ratio_counts(val(11, "left"))[0]
 
     points = PointStats(
         winners=winners,
@@ -571,7 +618,7 @@ def build_player_stats(
 
     # Parse break point stats
     # Row 10 Left: Break Points Won
-    bp_won = parse_ratio(val(10, "left"))
+    bp_won = parse_ratio_counts(val(10, "left"))
     # Row 10 Right: Breaks / Games
     # Careful: Row 10 Right is Breaks/Games, but break points saved is not explicitly there?
     # TE4 stats: "BREAK POINTS WON" is for the attacker. 
@@ -579,12 +626,12 @@ def build_player_stats(
     # But current logic was: set_points_saved = ???
     # Old logic: set_points_saved = parse_ratio(get_stat(["SET POINTS SAVED"]))[0]
     # Row 4 Right: Set Points Saved
-    set_saved = parse_ratio(val(4, "right"))[0]
+    set_saved = parse_ratio_counts(val(4, "right"))[0]
     # Row 5 Right: Match Points Saved
-    match_saved = parse_ratio(val(5, "right"))[0]
+    match_saved = parse_ratio_counts(val(5, "right"))[0]
     
     # Row 10 Right: Breaks / Games
-    break_games = parse_ratio(val(10, "right"))
+    break_games = parse_ratio_counts(val(10, "right"))
 
     break_points = BreakPointStats(
         break_points_won=bp_won[0],
@@ -623,61 +670,95 @@ def analyze_match_log(html_content: str) -> MatchStats | None:
         MatchStats model with complete statistics, or None if parsing fails.
     """
     try:
-        soup = BeautifulSoup(html_content, "lxml")
-
-        # Extract raw_match_id from table element
-        table = soup.find("table")
-        raw_match_id = table.get("id") if table else None
-
-        # Extract header info
-        info = extract_header_info(soup)
-        if not info:
-            logger.warning("Failed to extract match info from header, using defaults")
-            info = MatchInfo(
-                player1_name="Player 1",
-                player2_name="Player 2",
-                score="",
-                tournament="",
-                duration="",
-                real_duration="",
-                raw_match_id=raw_match_id,
-            )
-        else:
-            # Add raw_match_id to the extracted info
-            info.raw_match_id = raw_match_id
-
-        # Extract stats from table
-        stats = extract_stats_from_table(soup)
-        logger.info(f"Extracted {len(stats)} stat rows")
-
-        # Build player stats
-        player1 = build_player_stats(
-            stats, 
-            0, 
-            info.player1_name,
-            elo=info.player1_elo,
-            elo_diff=info.player1_elo_diff
-        )
-        player2 = build_player_stats(
-            stats, 
-            1, 
-            info.player2_name,
-            elo=info.player2_elo,
-            elo_diff=info.player2_elo_diff
-        )
+        tree = _parse_html(html_content)
+        if tree is None:
+            return build_match_stats([], [])
+        return build_match_stats(list(tree.iter("p")), list(tree.iter("table")))
+    except Exception as e:
+        logger.error(f"Failed to analyze match log: {e}")
+        return None
 
-        return MatchStats(
-            info=info,
-            player1=player1,
-            player2=player2,
+
+def build_match_stats(paragraphs: list[HtmlElement], tables: list[HtmlElement]) -> MatchStats:
+    """Build match statistics from a match's header paragraphs and tables.
+
+    Args:
+        paragraphs: <p> elements of the match, in document order.
+        tables: <table> elements of the match, in document order.
+
+    Returns:
+        MatchStats model with complete statistics.
+    """
+    # Extract raw_match_id from table element
+    table = tables[0] if tables else None
+    raw_match_id = table.get("id") if table is not None else None
+
+    # Extract header info
+    info = extract_header_from_paragraphs(paragraphs)
+    if not info:
+        logger.warning("Failed to extract match info from header, using defaults")
+        info = MatchInfo(
+            player1_name="Player 1",
+            player2_name="Player 2",
+            score="",
+            tournament="",
+            duration="",
+            real_duration="",
+            raw_match_id=raw_match_id,
         )
+    else:
+        # Add raw_match_id to the extracted info
+        info.raw_match_id = raw_match_id
+
+    # Extract stats from table
+    stats = extract_stats_from_tables(tables)
+    logger.info(f"Extracted {len(stats)} stat rows")
+
+    # Build player stats
+    player1 = build_player_stats(
+        stats, 
+        0, 
+        info.player1_name,
+        elo=info.player1_elo,
+        elo_diff=info.player1_elo_diff
+    )
+    player2 = build_player_stats(
+        stats, 
+        1, 
+        info.player2_name,
+        elo=info.player2_elo,
+        elo_diff=info.player2_elo_diff
+    )
 
+    return MatchStats(
+        info=info,
+        player1=player1,
+        player2=player2,
+    )
 
-    except Exception as e:
-        logger.error(f"Failed to analyze match log: {e}")
+
+def _parse_html(html_content: str) -> HtmlElement | None:
+    """Parse an HTML document with lxml, or return None if it has no content."""
+    try:
+        # libxml2 drops everything after </html>; strip document end tags so
+        # concatenated logs keep their later matches. lxml locks a parser while
+        # it runs, so each call (and upload thread) builds its own; comments
+        # never carry match data
+        parser = HTMLParser(remove_comments=True)
+        return document_fromstring(_DOC_END_RE.sub("", html_content), parser=parser)
+    except etree.ParserError:
+        # lxml refuses empty documents
         return None
 
 
+def _find_all(elements: list[HtmlElement], tag: str) -> list[HtmlElement]:
+    """Collect ``tag`` elements among ``elements`` and their descendants."""
+    found: list[HtmlElement] = []
+    for element in elements:
+        found.extend(element.iter(tag))
+    return found
+
+
 def parse_match_log_file(html_content: str) -> list[MatchStats]:
     """Parse a full match log file containing multiple matches.
 
@@ -689,26 +770,35 @@ def parse_match_log_file(html_content: str) -> list[MatchStats]:
     """
     matches: list[MatchStats] = []
     
-    # Split by horizontal rules <hr> which separate matches
-    # TE4 logs separate matches with <hr> or <hr/> or <hr >
-    # We'll split by regex to be safe
-    chunks = re.split(r"<hr\s*\/?>", html_content, flags=re.IGNORECASE)
+    # Parse the whole file once, then split it into matches at each <hr>
+    # (TE4 logs separate matches with horizontal rules)
+    tree = _parse_html(html_content)
+    chunks: list[list[HtmlElement]] = [[]]
+    if tree is not None:
+        for element in tree.iter("p", "table", "hr"):
+            # Nested elements are reached through their outermost p/table
+            if next(element.iterancestors("p", "table", "hr"), None) is not None:
+                continue
+            if element.tag == "hr":
+                chunks.append([])
+            else:
+                chunks[-1].append(element)
     
     logger.info(f"Found {len(chunks)} potential match chunks")
     
     for i, chunk in enumerate(chunks):
-        if not chunk.strip():
+        if not chunk:
             continue
 
         # Check for valid match indicators before parsing
-        # EN: "def.", FR: "bat.", ES: "vs", PL: "Przegrana"
-        chunk_separators = [" def. ", " bat. ", " vs ", " Przegrana "]
-        if not any(sep in chunk for sep in chunk_separators):
+        if not any(
+            sep in element.text_content() for element in chunk for sep in _MATCH_SEPARATORS
+        ):
             logger.debug(f"Skipping chunk {i} - no match indicators found")
             continue
             
         try:
-            stats = analyze_match_log(chunk)
+            stats = build_match_stats(_find_all(chunk, "p"), _find_all(chunk, "table"))
             # Only add if we actually extracted stats or have valid header info
             if stats and (stats.player1.points.total_points_won > 0 or (stats.info and stats.info.score)):
                  matches.append(stats)
@@ -738,6 +828,15 @@ async def process_uploaded_file(
         MatchAnalysisResponse with results or error.
     """
     try:
+        # No match header anywhere: skip decoding and parsing entirely
+        # (separators are ASCII, so this holds for every supported encoding)
+        if not any(sep in content for sep in _MATCH_SEPARATOR_BYTES):
+            return MatchAnalysisResponse(
+                success=False,
+                error="Failed to parse any matches from file",
+                filename=filename,
+            )
+
         # Decode content - try multiple encodings
         html_content = None
         for encoding in ["utf-8", "iso-8859-1", "latin-1", "cp1252"]:
@@ -754,8 +853,9 @@ async def process_uploaded_file(
                 filename=filename,
             )
 
-        # Analyze the match log
-        matches = parse_match_log_file(html_content)
+        # Analyze the match log in a worker thread so the event loop
+        # (live score polling, other requests) isn't blocked while parsing
+        matches = await asyncio.to_thread(parse_match_log_file, html_content)
 
         if matches:
             return MatchAnalysisResponse(
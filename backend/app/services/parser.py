@@ -5,6 +5,7 @@ and the GameInfo bitfield structure.
 """
 
 import re
+from functools import lru_cache
 from typing import Generator
 
 from app.core.logging import get_logger
@@ -20,9 +21,39 @@ from app.models.game_server import (
 logger = get_logger("parser")
 
 
+# Enum members indexed by their raw bitfield value
+# PlayerCfg is a 3-bit field but only 0-3 are known; the rest fall back to singles
+_PLAYER_CONFIGS = (
+    PlayerConfig.SINGLES,
+    PlayerConfig.UNKNOWN_1,
+    PlayerConfig.COMPETITIVE_DOUBLES,
+    PlayerConfig.COOPERATIVE_DOUBLES,
+    PlayerConfig.SINGLES,
+    PlayerConfig.SINGLES,
+    PlayerConfig.SINGLES,
+    PlayerConfig.SINGLES,
+)
+_SKILL_MODES = (
+    SkillMode.BEGINNER,
+    SkillMode.INTERMEDIATE,
+    SkillMode.ADVANCED,
+    SkillMode.EXPERT,
+)
+_CONTROL_MODES = (
+    ControlMode.KEYBOARD,
+    ControlMode.MOUSE,
+    ControlMode.GAMEPAD,
+    ControlMode.MIXED,
+)
+
+
+@lru_cache(maxsize=256)
 def parse_game_info_bitfield(value: int) -> GameInfo:
     """Parse the GameInfo hex value into structured data.
 
+    Lobbies reuse a handful of game settings, so results are memoized and
+    the same (frozen) GameInfo instance is shared between servers.
+
     Bitfield layout (28 bits):
     - Bits 0-1: Trial (2 bits)
     - Bits 2-4: PlayerCfg (3 bits)
@@ -53,29 +84,15 @@ def parse_game_info_bitfield(value: int) -> GameInfo:
     preview = (value >> 24) & 0x7  # 3 bits
     tiredness = bool((value >> 27) & 0x1)  # 1 bit
 
-    # Convert raw values to enums with bounds checking
-    try:
-        player_config = PlayerConfig(player_cfg_raw)
-    except ValueError:
-        player_config = PlayerConfig.SINGLES
-
-    try:
-        skill_mode = SkillMode(skill_mode_raw)
-    except ValueError:
-        skill_mode = SkillMode.INTERMEDIATE
-
-    try:
-        control_mode = ControlMode(control_mode_raw)
-    except ValueError:
-        control_mode = ControlMode.KEYBOARD
-
+    # Convert raw values to enums by index; the 2-bit fields always fit,
+    # PlayerCfg values past the enum fall back to singles
     return GameInfo(
         trial=trial,
-        player_config=player_config,
+        player_config=_PLAYER_CONFIGS[player_cfg_raw],
         nb_set=nb_set,
-        skill_mode=skill_mode,
+        skill_mode=_SKILL_MODES[skill_mode_raw],
         games_per_set=games_per_set,
-        control_mode=control_mode,
+        control_mode=_CONTROL_MODES[control_mode_raw],
         preview=preview,
         tiredness=tiredness,
     )
@@ -94,6 +111,9 @@ SERVER_PATTERN = re.compile(
     r"(\*)"  # Group 4: Asterisk marker
 )
 
+# SERVER_PATTERN group number of quoted strings; every other kind can start an entry
+_QUOTED = 1
+
 
 def tokenize_server_line(line: str) -> list[str]:
     """Tokenize a server entry line into components.
@@ -104,19 +124,15 @@ def tokenize_server_line(line: str) -> list[str]:
     Returns:
         List of tokens (strings and hex values).
     """
-    tokens = []
-    for match in SERVER_PATTERN.finditer(line):
-        # Check each group explicitly - empty strings "" are valid tokens!
-        # Group order: 1=quoted string, 2=IP address, 3=hex value, 4=asterisk
-        if match.group(1) is not None:  # Quoted string (can be empty "")
-            tokens.append(match.group(1))
-        elif match.group(2) is not None:  # Full IP address (e.g., 0.0.0.0)
-            tokens.append(match.group(2))
-        elif match.group(3) is not None:  # Hex value
-            tokens.append(match.group(3))
-        elif match.group(4) is not None:  # Asterisk marker
-            tokens.append(match.group(4))
-    return tokens
+    # Exactly one group matches per token and the others come back empty,
+    # so joining the groups yields the token (including empty quoted "")
+    return list(map("".join, SERVER_PATTERN.findall(line)))
+
+
+@lru_cache(maxsize=1024)
+def _hex_field(token: str) -> int:
+    """Memoized safe_int_from_hex; ports, flags and ELOs repeat across entries."""
+    return safe_int_from_hex(token)
 
 
 def parse_server_entry(tokens: list[str]) -> GameServer | None:
@@ -156,19 +172,19 @@ def parse_server_entry(tokens: list[str]) -> GameServer | None:
         ip = "0.0.0.0" if is_started else ip_raw
 
         # Parse numeric fields from hex
-        port = safe_int_from_hex(tokens[1])
+        port = _hex_field(tokens[1])
         match_name = tokens[2]
-        game_info_raw = safe_int_from_hex(tokens[3])
-        max_ping = safe_int_from_hex(tokens[4])
-        elo = safe_int_from_hex(tokens[5])
-        nb_game = safe_int_from_hex(tokens[6])
+        game_info_raw = _hex_field(tokens[3])
+        max_ping = _hex_field(tokens[4])
+        elo = _hex_field(tokens[5])
+        nb_game = _hex_field(tokens[6])
         tag_line = tokens[7]
         score = tokens[8]
-        other_elo = safe_int_from_hex(tokens[9])
-        give_up_rate = safe_int_from_hex(tokens[10])
-        reputation = safe_int_from_hex(tokens[11])
+        other_elo = _hex_field(tokens[9])
+        give_up_rate = _hex_field(tokens[10])
+        reputation = _hex_field(tokens[11])
         surface_name = tokens[12]
-        creation_time_ms = safe_int_from_hex(tokens[13])
+        creation_time_ms = _hex_field(tokens[13])
 
         # Parse GameInfo bitfield
         game_info = parse_game_info_bitfield(game_info_raw)
@@ -211,28 +227,18 @@ def parse_server_data(raw_data: str) -> Generator[GameServer, None, None]:
     # Split data by common patterns that indicate new entries
     # Look for patterns like "0 " or IP addresses at the start
     current_tokens: list[str] = []
-    all_tokens = tokenize_server_line(raw_data)
-
-    # Process tokens and identify server boundaries
-    # Server entries start with IP (0, *, or IP address) followed by port
-    i = 0
-    while i < len(all_tokens):
-        token = all_tokens[i]
-
-        # Check for server entry boundary
-        # Entries typically start with 0, *, or an IP-like pattern
-        is_boundary = (
-            token in ("0", "*", "0.0.0.0")
-            or re.match(r"^\d+\.\d+\.\d+\.\d+$", token)
-            or (
-                current_tokens
-                and len(current_tokens) >= 14
-                and re.match(r"^[0-9A-Fa-f]+$", token)
-                and i + 1 < len(all_tokens)
-            )
-        )
 
-        if is_boundary and current_tokens and len(current_tokens) >= 14:
+    # Tokenize and split in one pass over the regex matches.
+    # Server entries start with IP (0, *, or IP address) followed by port, so
+    # any unquoted token after a complete entry begins the next one. A stray
+    # trailing token after the last entry starts a one-token entry of its own,
+    # which is dropped below for being too short.
+    for match in SERVER_PATTERN.finditer(raw_data):
+        # Every alternative is a group, so lastindex is always set
+        kind = match.lastindex or 0
+        token = match.group(kind)
+
+        if kind != _QUOTED and len(current_tokens) >= 14:
             # Parse current entry
             server = parse_server_entry(current_tokens)
             if server:
@@ -241,8 +247,6 @@ def parse_server_data(raw_data: str) -> Generator[GameServer, None, None]:
         else:
             current_tokens.append(token)
 
-        i += 1
-
     # Parse final entry
     if current_tokens and len(current_tokens) >= 14:
         server = parse_server_entry(current_tokens)
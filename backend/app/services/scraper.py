@@ -109,7 +109,7 @@ class ScraperService:
             client = await self.get_client()
             response = await client.get(url)
             response.raise_for_status()
-            logger.info(f"Fetched {len(response.text)} chars from {url}")
+            logger.info("Fetched %d chars from %s", len(response.text), url)
             return response.text
         except httpx.TimeoutException:
             logger.error(f"Timeout fetching {url}")
@@ -137,7 +137,7 @@ class ScraperService:
         servers: list[GameServer] = []
         if raw_data:
             servers = list(parse_server_data(raw_data))
-            logger.info(f"Parsed {len(servers)} servers")
+            logger.info("Parsed %d servers", len(servers))
 
         # Track finished matches for stats
         if track_stats and servers:
@@ -146,7 +146,7 @@ class ScraperService:
             stats_service = get_stats_service()
             finished = await stats_service.track_matches(servers)
             if finished > 0:
-                logger.info(f"Detected {finished} finished matches")
+                logger.info("Queued %d finished matches", finished)
 
         # Update cache
         result = GameServerList(
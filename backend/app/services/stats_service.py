@@ -4,12 +4,17 @@ Tracks finished matches (5+ games) and persists daily statistics.
 Stateless implementation relying on Database for concurrency safety.
 """
 
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import date, datetime, timedelta
 from typing import Any
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import select, update
+from sqlalchemy import func, select, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
 from app.core.database import get_session_factory
@@ -22,6 +27,28 @@ from app.models.player_alias import PlayerAlias
 logger = get_logger("stats_service")
 
 
+def _set_games(token: str) -> int:
+    """Return games played in one set token like '7/6(4)', or 0 if not a set."""
+    if "/" not in token:
+        return 0
+    parts = token.split("/")
+    g1_str = "".join(c for c in parts[0] if c.isdigit())
+    g2_str = "".join(c for c in parts[1].split("(")[0] if c.isdigit())
+    if not (g1_str and g2_str):
+        return 0
+    try:
+        return int(g1_str) + int(g2_str)
+    except ValueError:
+        return 0
+
+
+def count_games(score: str | None) -> int:
+    """Total games played across all sets in a score string (e.g. '6/4 7/6(3)')."""
+    if not score:
+        return 0
+    return sum(_set_games(s) for s in score.split())
+
+
 class StatsService:
     """Service for tracking and persisting match statistics.
     
@@ -32,6 +59,18 @@ class StatsService:
     # Minimum games required to count a match as "played"
     MIN_GAMES_THRESHOLD = 5
 
+    # How long the current date may be reused before re-reading the clock
+    TODAY_CACHE_SECONDS = 60.0
+
+    # Rows fetched per round trip when streaming finished-match history
+    STREAM_BATCH_SIZE = 1000
+
+    # Maximum finished matches written per background transaction
+    WRITE_BATCH_SIZE = 100
+
+    # Match format indexed by game_info.nb_set
+    _FORMATS = ("bo1", "bo1", "bo3", "bo5")
+
     def __init__(self) -> None:
         """Initialize the stats service."""
         self.settings = get_settings()
@@ -41,10 +80,33 @@ class StatsService:
         # This is safe per-worker because it's only for change detection,
         # the actual "counting" is enforced by the DB.
         self._previous_matches: dict[str, GameServer] = {}
+        self._today_cached: date = date.min
+        self._today_expires: float = 0.0
+
+        # Finished matches waiting to be persisted by the background writer
+        self._write_queue: asyncio.Queue[tuple[GameServer, str, date]] | None = None
+        self._writer_task: asyncio.Task[None] | None = None
+        # Match IDs this worker already queued today (cheap pre-check before the DB)
+        self._queued_match_ids: set[str] = set()
+        self._queued_date: date = date.min
 
     def _get_today(self) -> date:
-        """Get current date in configured timezone."""
-        return datetime.now(self.timezone).date()
+        """Get current date in configured timezone.
+
+        Cached for up to TODAY_CACHE_SECONDS, never past local midnight.
+        """
+        now = time.monotonic()
+        if now < self._today_expires:
+            return self._today_cached
+
+        current = datetime.now(self.timezone)
+        midnight = datetime.combine(
+            current.date() + timedelta(days=1), datetime.min.time(), self.timezone
+        )
+        seconds_left = (midnight - current).total_seconds()
+        self._today_cached = current.date()
+        self._today_expires = now + min(self.TODAY_CACHE_SECONDS, seconds_left)
+        return self._today_cached
 
     def _detect_mod(self, server: GameServer) -> str:
         """Detect mod type from server tag_line."""
@@ -58,33 +120,39 @@ class StatsService:
     def _detect_format(self, server: GameServer) -> str:
         """Detect match format from game_info.nb_set."""
         nb_set = server.game_info.nb_set
-        if nb_set in (0, 1):
-            return "bo1"
-        elif nb_set == 2:
-            return "bo3"
-        elif nb_set == 3:
-            return "bo5"
+        if 0 <= nb_set < len(self._FORMATS):
+            return self._FORMATS[nb_set]
         return "bo1"  # Default
 
     async def track_matches(self, current_servers: list[GameServer]) -> int:
         """Track finished matches from the current server list.
 
+        Finished matches are queued for the background writer rather than
+        written inline, so a slow database never stalls the polling loop.
+
         Args:
             current_servers: Current list of live servers.
 
         Returns:
-            Number of newly finished matches detected.
+            Number of finished matches queued for persistence. Duplicates
+            rejected later by the database are still included; call
+            save_to_db() to wait for the writes to land.
         """
         today = self._get_today()
         
         # Build current matches dict
         current_matches = {s.match_id: s for s in current_servers}
         
+        # Fast path: same set of matches as last tick, nothing can have finished.
+        # Still keep the fresh snapshots so scores/game counts stay current.
+        if current_matches.keys() == self._previous_matches.keys():
+            self._previous_matches = current_matches
+            return 0
+        
         # Identify potentially finished matches (in previous but not in current)
-        previous_ids = set(self._previous_matches.keys())
-        current_ids = set(current_matches.keys())
-        missing_ids = previous_ids - current_ids
-        new_ids = current_ids - previous_ids
+        # Dict key views support set difference directly, no intermediate copies
+        missing_ids = self._previous_matches.keys() - current_matches.keys()
+        new_ids = current_matches.keys() - self._previous_matches.keys()
         
         # Helper for rename detection
         def _get_identity_key(s: GameServer) -> tuple:
@@ -101,6 +169,11 @@ class StatsService:
             for mid in new_ids
         }
 
+        if today != self._queued_date:
+            # Day rollover: IDs from yesterday can't reappear under today's date
+            self._queued_match_ids.clear()
+            self._queued_date = today
+
         finished_count = 0
         
         for match_id in missing_ids:
@@ -112,14 +185,19 @@ class StatsService:
             
             if migrated_id:
                 migrated_server = current_matches[migrated_id]
-                p1_names = {n.lower().strip() for n in server.player_names if n != "Unknown"}
-                p2_names = {n.lower().strip() for n in migrated_server.player_names if n != "Unknown"}
-                is_p1_waiting = not p1_names or "waiting" in p1_names
-                has_overlap = is_p1_waiting or not p2_names or bool(p1_names & p2_names)
+                has_overlap = (
+                    server.is_waiting
+                    or not migrated_server.norm_players
+                    or not server.norm_players.isdisjoint(migrated_server.norm_players)
+                )
                 
                 if has_overlap:
                     if migrated_server.nb_game >= server.nb_game:
-                        logger.info(f"Match RENAMED: {server.match_name} -> {migrated_server.match_name}. Not counting.")
+                        logger.info(
+                            "Match RENAMED: %s -> %s. Not counting.",
+                            server.match_name,
+                            migrated_server.match_name,
+                        )
                         continue
 
             # 2. VALIDATION
@@ -127,111 +205,163 @@ class StatsService:
             has_enough_games = server.nb_game >= self.MIN_GAMES_THRESHOLD
             
             if is_started and has_enough_games:
-                # 3. ATOMIC DB WRITE
-                # Try to finish the match. DB constraint prevents double counting.
-                counted = await self._try_finish_match(server, today)
-                if counted:
+                if match_id in self._queued_match_ids:
+                    continue  # Already queued by this worker today
+                clean_score = self._validate_finished_score(server)
+                if clean_score is not None:
+                    self._queued_match_ids.add(match_id)
+                    # 3. QUEUE DB WRITE
+                    # Persisted by the background writer; the DB constraint
+                    # still prevents double counting across workers.
+                    self._enqueue_finished_match(server, clean_score, today)
                     finished_count += 1
-                    logger.info(f"✅ COUNTED: {server.match_name} ({server.nb_game} games)")
-                else:
-                    logger.info(f"Received duplicate finish for {server.match_name} (already counted by another worker)")
             else:
                 pass # Ignored (waiting or too short)
 
         self._previous_matches = current_matches
         return finished_count
 
-    async def _try_finish_match(self, server: GameServer, date_obj: date) -> bool:
-        """Atomically record finished match and update aggregates.
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[AsyncSession]:
+        """Open a session with a transaction that commits on exit.
 
-        Returns:
-            True if match was newly counted, False if already existed.
+        Rolls back automatically if the block raises.
         """
         session_factory = get_session_factory()
-        async with session_factory() as session:
+        async with session_factory() as session, session.begin():
+            yield session
+
+    def _validate_finished_score(self, server: GameServer) -> str | None:
+        """Return the cleaned final score, or None if the match should be ignored."""
+        # We want to strip out intermediate game scores (e.g. ' -- 40:15' or ' -- 0:0*')
+        # Examples: '6/4 5/4 -- 40:A*' -> '6/4 5/4', '0/0 -- 0:0' -> ''
+        clean_score = server.score
+        if " -- " in clean_score:
+            clean_score = clean_score.split(" -- ")[0].strip()
+        
+        # Check if it's an obviously unstarted or blank score (like '...' or '0/0')
+        if not clean_score or clean_score == "..." or clean_score == "0/0":
+            logger.warning(
+                "Ignoring finished match %s due to invalid score: '%s'",
+                server.match_id,
+                server.score,
+            )
+            # Dropped safely (not counted, not retried) since it's removed
+            # from previous_matches.
+            return None
+        
+        # Check for minimum games threshold (5)
+        total_games = count_games(clean_score)
+                            
+        if total_games < 5:
+            logger.warning(
+                "Ignoring finished match %s due to insufficient games (%d): '%s'",
+                server.match_id,
+                total_games,
+                clean_score,
+            )
+            return None
+        return clean_score
+
+    def _enqueue_finished_match(self, server: GameServer, clean_score: str, date_obj: date) -> None:
+        """Queue a finished match for the background writer, starting it if needed."""
+        loop = asyncio.get_running_loop()
+        task = self._writer_task
+        queue = self._write_queue
+        if queue is None or (task is not None and task.get_loop() is not loop):
+            # Queues are bound to their event loop; start fresh on a new one
+            queue = self._write_queue = asyncio.Queue()
+            task = None
+        if task is None or task.done():
+            self._writer_task = loop.create_task(self._writer_loop(queue))
+        queue.put_nowait((server, clean_score, date_obj))
+
+    async def _writer_loop(self, queue: asyncio.Queue[tuple[GameServer, str, date]]) -> None:
+        """Persist queued finished matches in batches until cancelled."""
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.WRITE_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
             try:
-                # 1. Clean the score and validate
-                # We want to strip out intermediate game scores (e.g. ' -- 40:15' or ' -- 0:0*')
-                # Examples: '6/4 5/4 -- 40:A*' -> '6/4 5/4', '0/0 -- 0:0' -> ''
-                clean_score = server.score
-                if " -- " in clean_score:
-                    clean_score = clean_score.split(" -- ")[0].strip()
-                
-                # Check if it's an obviously unstarted or blank score (like '...' or '0/0')
-                if not clean_score or clean_score == "..." or clean_score == "0/0":
-                    logger.warning(f"Ignoring finished match {server.match_id} due to invalid score: '{server.score}'")
-                    # We still return True to mark it 'processed/ignored' so we don't keep trying,
-                    # but we don't insert it or count it. Actually returning False is better so
-                    # we don't increment the API count either. But we don't want to retry it.
-                    # Returning True essentially drops it safely since it's removed from previous_matches.
-                    return False
-                
-                # Check for minimum games threshold (5)
-                total_games = 0
-                if clean_score:
-                    sets = clean_score.split()
-                    for s in sets:
-                        if "/" in s:
-                            parts = s.split("/")
-                            g1_str = "".join(c for c in parts[0] if c.isdigit())
-                            g2_str = "".join(c for c in parts[1].split("(")[0] if c.isdigit())
-                            if g1_str and g2_str:
-                                try:
-                                    total_games += int(g1_str) + int(g2_str)
-                                except ValueError:
-                                    pass
-                                    
-                if total_games < 5:
-                    logger.warning(f"Ignoring finished match {server.match_id} due to insufficient games ({total_games}): '{clean_score}'")
-                    return False
-                
-                # Deduce winner from clean score
-                deduced_winner = self._determine_winner(server.match_name, clean_score)
-                
-                # 2. Insert into finished_matches (Atomic Guard)
-                match_record = FinishedMatch(
-                    match_id=server.match_id,
-                    date=date_obj,
-                    match_name=server.match_name,
-                    score=clean_score,
-                    winner=deduced_winner,
-                    p1_elo=server.elo,
-                    p2_elo=server.other_elo
-                )
-                session.add(match_record)
-                await session.flush() # Check constraints immediately
-                
-                # 2. Update Aggregates (Only if insert succeeded)
-                mod = self._detect_mod(server)
-                fmt = self._detect_format(server)
-                
-                # Ensure aggregate record exists
-                await self._ensure_daily_record(session, date_obj)
-                
-                # Increment counters atomically using SQL expressions
-                stmt = (
-                    update(DailyStats)
-                    .where(DailyStats.stats_date == date_obj)
-                    .values({
-                        getattr(DailyStats, f"{mod}_total"): getattr(DailyStats, f"{mod}_total") + 1,
-                        getattr(DailyStats, f"{mod}_{fmt}"): getattr(DailyStats, f"{mod}_{fmt}") + 1
-                    })
+                await self._write_finished_matches(batch)
+            except Exception as e:
+                # Forget the IDs so the match can be queued again if it shows up
+                lost_ids = [server.match_id for server, _, _ in batch]
+                self._queued_match_ids.difference_update(lost_ids)
+                logger.error(
+                    "Error writing %d finished matches, not counted: %s (%s)",
+                    len(batch),
+                    ", ".join(lost_ids),
+                    e,
                 )
-                await session.execute(stmt)
-                
-                await session.commit()
-                return True
+            finally:
+                for _ in batch:
+                    queue.task_done()
 
-            except IntegrityError:
-                # Match ID already exists - ignore
-                await session.rollback()
-                return False
-            except Exception as e:
-                logger.error(f"Error finishing match {server.match_id}: {e}")
-                await session.rollback()
-                return False
+    async def _write_finished_matches(self, batch: list[tuple[GameServer, str, date]]) -> None:
+        """Record a batch of finished matches in one transaction.
+
+        Each match gets its own savepoint, so a duplicate (already counted by
+        another worker) only skips that match.
+        """
+        counted: list[GameServer] = []
+        async with self._session() as session:
+            for server, clean_score, date_obj in batch:
+                try:
+                    async with session.begin_nested():
+                        await self._record_finished_match(session, server, clean_score, date_obj)
+                except IntegrityError:
+                    logger.info(
+                        "Received duplicate finish for %s (already counted by another worker)",
+                        server.match_name,
+                    )
+                    continue
+                counted.append(server)
 
-    async def _ensure_daily_record(self, session, date_obj: date) -> None:
+        # Only report once the transaction has committed
+        for server in counted:
+            logger.info("✅ COUNTED: %s (%d games)", server.match_name, server.nb_game)
+
+    async def _record_finished_match(
+        self, session: AsyncSession, server: GameServer, clean_score: str, date_obj: date
+    ) -> None:
+        """Insert the finished match and bump the daily aggregates.
+
+        Raises:
+            IntegrityError: If the match was already recorded.
+        """
+        # Insert into finished_matches (Atomic Guard)
+        match_record = FinishedMatch(
+            match_id=server.match_id,
+            date=date_obj,
+            match_name=server.match_name,
+            score=clean_score,
+            winner=self._determine_winner(server.match_name, clean_score),
+            p1_elo=server.elo,
+            p2_elo=server.other_elo
+        )
+        session.add(match_record)
+        await session.flush() # Check constraints immediately
+        
+        # Update Aggregates (Only if insert succeeded)
+        mod = self._detect_mod(server)
+        fmt = self._detect_format(server)
+        
+        # Ensure aggregate record exists
+        await self._ensure_daily_record(session, date_obj)
+        
+        # Increment counters atomically using SQL expressions
+        stmt = (
+            update(DailyStats)
+            .where(DailyStats.stats_date == date_obj)
+            .values({
+                getattr(DailyStats, f"{mod}_total"): getattr(DailyStats, f"{mod}_total") + 1,
+                getattr(DailyStats, f"{mod}_{fmt}"): getattr(DailyStats, f"{mod}_{fmt}") + 1
+            })
+        )
+        await session.execute(stmt)
+
+    async def _ensure_daily_record(self, session: AsyncSession, date_obj: date) -> None:
         """Ensure DailyStats record exists for today."""
         # Check existence first to avoid write locks if possible
         result = await session.execute(
@@ -240,18 +370,28 @@ class StatsService:
         if result.scalar_one_or_none():
             return
 
-        # Try insert (ignore race conditions via ON CONFLICT DO NOTHING equivalent logic)
+        # Try insert inside a savepoint so a lost race only undoes this insert,
+        # not the caller's pending work in the same transaction
         try:
-            # We can just attempt insert; if it fails due to unique constraint, that's fine
-            session.add(DailyStats(stats_date=date_obj))
-            await session.flush()
+            async with session.begin_nested():
+                session.add(DailyStats(stats_date=date_obj))
         except IntegrityError:
             # Another worker created it just now
-            await session.rollback()
+            pass
 
     async def save_to_db(self) -> None:
-        """No-op for stateless service compatibility."""
-        pass
+        """Flush queued finished matches and stop the background writer."""
+        task = self._writer_task
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            return
+        if self._write_queue is not None and not task.done():
+            await self._write_queue.join()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        self._writer_task = None
 
     def _determine_winner(self, match_name: str, clean_score: str) -> str | None:
         """Deduce the winner based on match name and score string.
@@ -421,14 +561,24 @@ class StatsService:
         try:
             session_factory = get_session_factory()
             async with session_factory() as session:
+                # Roll up in SQL: one row of per-column sums instead of every day
+                mods = ("xkt", "wtsl", "vanilla")
+                fields = ("total", "bo1", "bo3", "bo5")
                 result = await session.execute(
-                    select(DailyStats)
+                    select(
+                        func.count(DailyStats.id),
+                        *(
+                            func.sum(getattr(DailyStats, f"{mod}_{field}"))
+                            for mod in mods
+                            for field in fields
+                        ),
+                    )
                     .where(DailyStats.stats_date >= start_date)
                     .where(DailyStats.stats_date <= end_date)
                 )
-                records = result.scalars().all()
+                days_count, *sums = result.one()
                 
-                if not records:
+                if not days_count:
                     return {
                         "date_range": f"{start_date.isoformat()} to {end_date.isoformat()}",
                         "days_recorded": 0,
@@ -437,45 +587,33 @@ class StatsService:
                         "vanilla": {"avg_total": 0, "avg_bo1": 0, "avg_bo3": 0, "avg_bo5": 0},
                     }
                 
-                days_count = len(records)
-                
-                def avg(vals: list[int]) -> int:
-                    return sum(vals) // days_count
-                    
-                return {
+                totals = iter(sums)
+                response: dict[str, Any] = {
                     "date_range": f"{start_date.isoformat()} to {end_date.isoformat()}",
                     "days_recorded": days_count,
-                    "xkt": {
-                        "avg_total": avg([r.xkt_total for r in records]),
-                        "avg_bo1": avg([r.xkt_bo1 for r in records]),
-                        "avg_bo3": avg([r.xkt_bo3 for r in records]),
-                        "avg_bo5": avg([r.xkt_bo5 for r in records]),
-                    },
-                    "wtsl": {
-                        "avg_total": avg([r.wtsl_total for r in records]),
-                        "avg_bo1": avg([r.wtsl_bo1 for r in records]),
-                        "avg_bo3": avg([r.wtsl_bo3 for r in records]),
-                        "avg_bo5": avg([r.wtsl_bo5 for r in records]),
-                    },
-                    "vanilla": {
-                        "avg_total": avg([r.vanilla_total for r in records]),
-                        "avg_bo1": avg([r.vanilla_bo1 for r in records]),
-                        "avg_bo3": avg([r.vanilla_bo3 for r in records]),
-                        "avg_bo5": avg([r.vanilla_bo5 for r in records]),
-                    },
                 }
+                for mod in mods:
+                    response[mod] = {
+                        f"avg_{field}": (next(totals) or 0) // days_count
+                        for field in fields
+                    }
+                return response
         except Exception as e:
             logger.error(f"Failed to fetch monthly stats: {e}")
             return {}
 
-    async def _load_alias_map(self) -> dict[str, str]:
-        """Load alias->canonical_name map from DB (all lowercase keys)."""
+    async def _load_alias_map(self, session: AsyncSession) -> dict[str, str]:
+        """Load alias->canonical_name map from DB (all lowercase keys).
+
+        Runs in a savepoint, so a failed lookup (e.g. the table is not migrated
+        yet) leaves the caller's transaction usable for its own queries.
+        """
         try:
-            session_factory = get_session_factory()
-            async with session_factory() as session:
-                result = await session.execute(select(PlayerAlias))
-                aliases = result.scalars().all()
-                return {a.alias: a.canonical_name for a in aliases}
+            async with session.begin_nested():
+                result = await session.execute(
+                    select(PlayerAlias.alias, PlayerAlias.canonical_name)
+                )
+                return dict(result.all())
         except Exception as e:
             logger.error(f"Failed to load alias map: {e}")
             return {}
@@ -500,22 +638,23 @@ class StatsService:
             end_date = today
         
         try:
-            alias_map = await self._load_alias_map()
             session_factory = get_session_factory()
             async with session_factory() as session:
-                result = await session.execute(
+                # Match rows are streamed in batches instead of loaded at once
+                alias_map = await self._load_alias_map(session)
+                result = await session.stream(
                     select(FinishedMatch.match_name, FinishedMatch.p1_elo, FinishedMatch.p2_elo, FinishedMatch.score)
                     .where(FinishedMatch.date >= start_date)
                     .where(FinishedMatch.date <= end_date)
                     .order_by(FinishedMatch.created_at.asc())
+                    .execution_options(yield_per=self.STREAM_BATCH_SIZE)
                 )
-                match_records = result.all()
                 
                 from collections import Counter
                 player_counts = Counter()
                 player_latest_elo = {}
                 
-                for row in match_records:
+                async for row in result:
                     name = row.match_name
                     p1_elo = row.p1_elo
                     p2_elo = row.p2_elo
@@ -524,19 +663,7 @@ class StatsService:
                         continue
                         
                     # Filter out matches with less than 5 games
-                    total_games = 0
-                    if row.score:
-                        sets = row.score.split()
-                        for s in sets:
-                            if "/" in s:
-                                parts = s.split("/")
-                                g1_str = "".join(c for c in parts[0] if c.isdigit())
-                                g2_str = "".join(c for c in parts[1].split("(")[0] if c.isdigit())
-                                if g1_str and g2_str:
-                                    try:
-                                        total_games += int(g1_str) + int(g2_str)
-                                    except ValueError:
-                                        pass
+                    total_games = count_games(row.score)
                     if total_games < 5:
                         continue
                         
@@ -572,10 +699,10 @@ class StatsService:
     async def get_all_players_async(self) -> list[dict[str, Any]]:
         """Get all players ever recorded with their latest ELO, total matches, and last match date."""
         try:
-            alias_map = await self._load_alias_map()
             session_factory = get_session_factory()
             async with session_factory() as session:
-                result = await session.execute(
+                alias_map = await self._load_alias_map(session)
+                result = await session.stream(
                     select(
                         FinishedMatch.match_name,
                         FinishedMatch.p1_elo,
@@ -584,8 +711,8 @@ class StatsService:
                         FinishedMatch.score,
                     )
                     .order_by(FinishedMatch.created_at.asc())
+                    .execution_options(yield_per=self.STREAM_BATCH_SIZE)
                 )
-                match_records = result.all()
 
                 from collections import Counter
 
@@ -593,7 +720,7 @@ class StatsService:
                 player_latest_elo: dict[str, int] = {}
                 player_last_date: dict[str, date] = {}
 
-                for row in match_records:
+                async for row in result:
                     name = row.match_name
                     p1_elo = row.p1_elo
                     p2_elo = row.p2_elo
@@ -603,19 +730,7 @@ class StatsService:
                         continue
                         
                     # Filter out matches with less than 5 games
-                    total_games = 0
-                    if row.score:
-                        sets = row.score.split()
-                        for s in sets:
-                            if "/" in s:
-                                parts = s.split("/")
-                                g1_str = "".join(c for c in parts[0] if c.isdigit())
-                                g2_str = "".join(c for c in parts[1].split("(")[0] if c.isdigit())
-                                if g1_str and g2_str:
-                                    try:
-                                        total_games += int(g1_str) + int(g2_str)
-                                    except ValueError:
-                                        pass
+                    total_games = count_games(row.score)
                     if total_games < 5:
                         continue
 
@@ -666,10 +781,10 @@ class StatsService:
         worst loss, and recent activity counts.
         """
         try:
-            alias_map = await self._load_alias_map()
             session_factory = get_session_factory()
             async with session_factory() as session:
-                result = await session.execute(
+                alias_map = await self._load_alias_map(session)
+                result = await session.stream(
                     select(
                         FinishedMatch.match_name,
                         FinishedMatch.score,
@@ -679,8 +794,8 @@ class StatsService:
                         FinishedMatch.date,
                     )
                     .order_by(FinishedMatch.date.desc())
+                    .execution_options(yield_per=self.STREAM_BATCH_SIZE)
                 )
-                all_matches = result.all()
 
                 # Resolve which names map to this player
                 target_lower = player_name.lower()
@@ -703,7 +818,7 @@ class StatsService:
                 matches_last_7 = 0
                 matches_last_30 = 0
 
-                for row in all_matches:
+                async for row in result:
                     name = row.match_name
                     if not name or " vs " not in name:
                         continue
@@ -719,19 +834,7 @@ class StatsService:
                         continue
 
                     # Calculate total games played to filter out aborted matches
-                    total_games = 0
-                    if row.score:
-                        sets = row.score.split()
-                        for s in sets:
-                            if "/" in s:
-                                parts = s.split("/")
-                                g1_str = "".join(c for c in parts[0] if c.isdigit())
-                                g2_str = "".join(c for c in parts[1].split("(")[0] if c.isdigit())
-                                if g1_str and g2_str:
-                                    try:
-                                        total_games += int(g1_str) + int(g2_str)
-                                    except ValueError:
-                                        pass
+                    total_games = count_games(row.score)
                                         
                     # Ignore matches with less than 5 games (aborted early)
                     if total_games < 5:
@@ -13,4 +13,10 @@ async def main():
     print("Database initialized successfully.")
 
 if __name__ == "__main__":
+    # uvloop ships with uvicorn[standard]; fall back to the default loop without it
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
@@ -5,38 +5,7 @@ from fastapi.testclient import TestClient
 
 from app.main import app
 
-
-@pytest.fixture
-def client() -> TestClient:
-    """Create a test client for the FastAPI application.
-
-    Yields:
-        TestClient instance.
-    """
-    return TestClient(app)
-
-
-@pytest.fixture
-def sample_server_data() -> str:
-    """Sample server data for testing parser.
-
-    Returns:
-        Raw server data string.
-    """
-    return (
-        '0 E9FD "RBI vs TestPlayer" 1B198E41 96 415 3 "XKT v4.2d" '
-        '"6/3 4/6 1/1 -- 00:40•" 393 0 1 "BlueGreenCement" 69760194'
-    )
-
-
-@pytest.fixture
-def sample_match_html() -> str:
-    """Sample match log HTML for testing analyzer.
-
-    Returns:
-        HTML content string.
-    """
-    return """
+SAMPLE_MATCH_HTML = """
     <html>
     <body>
     <p>Roger Federer (ELO: 1500 +30) def. Rafael Nadal (ELO: 1450 -30) : 6/4 7/5 - Test Tournament - 1:45:00 (2:30:00) - 2024-01-15 14:30</p>
@@ -76,17 +45,7 @@ def sample_match_html() -> str:
     </html>
     """
 
-
-@pytest.fixture
-def sample_spanish_match_html() -> str:
-    """Sample Spanish match log HTML for testing analyzer.
-
-    Uses 'vs' separator and includes '; Crc = ...' in ELO strings.
-
-    Returns:
-        HTML content string.
-    """
-    return """
+SAMPLE_SPANISH_MATCH_HTML = """
     <html>
     <body>
     <p><input type="checkbox" onClick="SetVis(this, '-37549154')">alnicozu (ELO: 1606 +19 ; Crc = 13198898) vs Franky Franchicha (ELO: 1772 -19 ; Crc = 14394570) : 6/3 - AO Rod Laver Day - 0:10'47 (0:32'35) - 2026-01-23 16:00 [Online]</p>
@@ -118,17 +77,7 @@ def sample_spanish_match_html() -> str:
     </html>
     """
 
-
-@pytest.fixture
-def sample_polish_match_html() -> str:
-    """Sample Polish match log HTML for testing analyzer.
-
-    Uses 'Przegrana' separator and Doubles format with Crc.
-
-    Returns:
-        HTML content string.
-    """
-    return """
+SAMPLE_POLISH_MATCH_HTML = """
     <html>
     <body>
     <p><input type="checkbox" onClick="SetVis(this, '-12345678')">POLAND (Crc = 7334370)) & Lleyton Hewitt (Crc = 3698732)) Przegrana Marcolino (Crc = 2225459)) & Bob Bryan (Crc = 13054943)) : 6/3 6/7(4) 6/3 - AO Rod Laver Night - 0:46'09 (2:13'07) - 2026-02-07 10:56 [Online]</p>
@@ -160,3 +109,73 @@ def sample_polish_match_html() -> str:
     </html>
     """
 
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    """Create a test client shared by the whole test session.
+
+    The client is not entered as a context manager, so the app lifespan
+    (database setup and server polling) is not started.
+
+    Returns:
+        TestClient instance.
+    """
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def sample_server_data() -> str:
+    """Sample server data for testing parser.
+
+    Returns:
+        Raw server data string.
+    """
+    return (
+        '0 E9FD "RBI vs TestPlayer" 1B198E41 96 415 3 "XKT v4.2d" '
+        '"6/3 4/6 1/1 -- 00:40•" 393 0 1 "BlueGreenCement" 69760194'
+    )
+
+
+@pytest.fixture(scope="session")
+def sample_match_html() -> str:
+    """Sample match log HTML for testing analyzer.
+
+    Returns:
+        HTML content string.
+    """
+    return SAMPLE_MATCH_HTML
+
+
+@pytest.fixture(scope="session")
+def sample_match_html_bytes(sample_match_html: str) -> bytes:
+    """Sample match log HTML encoded for upload tests.
+
+    Returns:
+        UTF-8 encoded HTML content.
+    """
+    return sample_match_html.encode("utf-8")
+
+
+@pytest.fixture(scope="session")
+def sample_spanish_match_html() -> str:
+    """Sample Spanish match log HTML for testing analyzer.
+
+    Uses 'vs' separator and includes '; Crc = ...' in ELO strings.
+
+    Returns:
+        HTML content string.
+    """
+    return SAMPLE_SPANISH_MATCH_HTML
+
+
+@pytest.fixture(scope="session")
+def sample_polish_match_html() -> str:
+    """Sample Polish match log HTML for testing analyzer.
+
+    Uses 'Przegrana' separator and Doubles format with Crc.
+
+    Returns:
+        HTML content string.
+    """
+    return SAMPLE_POLISH_MATCH_HTML
+
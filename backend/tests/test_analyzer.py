@@ -1,10 +1,14 @@
 """Tests for the analyzer service."""
 
+import pytest
 
 from app.services.analyzer import (
     analyze_match_log,
+    parse_match_log_file,
     parse_ratio,
+    parse_ratio_counts,
     parse_speed,
+    process_uploaded_file,
 )
 
 
@@ -39,6 +43,18 @@ class TestParseRatio:
         assert result == (0, 0, 0.0)
 
 
+class TestParseRatioCounts:
+    """Tests for count-only ratio parsing."""
+
+    @pytest.mark.parametrize(
+        "text",
+        ["2 / 5 = 40%", "62% (41/66)", "2 / 5", "62%", "5", " 6", "226 Km/h", ""],
+    )
+    def test_counts_match_parse_ratio(self, text: str) -> None:
+        """Test that counts agree with parse_ratio for every supported shape."""
+        assert parse_ratio_counts(text) == parse_ratio(text)[:2]
+
+
 class TestParseSpeed:
     """Tests for speed string parsing."""
 
@@ -190,3 +206,59 @@ class TestPolishMatchLog:
         assert result.player1.points.total_points_won == 108
         # P2 total points = 88
         assert result.player2.points.total_points_won == 88
+
+
+def _body(html: str) -> str:
+    """Return the markup between <body> and </body>."""
+    return html.split("<body>", 1)[1].split("</body>", 1)[0]
+
+
+class TestParseMatchLogFile:
+    """Tests for splitting a log file into matches."""
+
+    def test_matches_split_by_hr(
+        self, sample_match_html: str, sample_spanish_match_html: str
+    ) -> None:
+        """Test that matches separated by <hr> in one document are parsed separately."""
+        html = (
+            f"<html><body>{_body(sample_match_html)}<hr>"
+            f"{_body(sample_spanish_match_html)}</body></html>"
+        )
+        matches = parse_match_log_file(html)
+
+        assert len(matches) == 2
+        assert matches[0].info.player1_name == "Roger Federer"
+        assert matches[0].info.score == "6/4 7/5"
+        assert matches[1].info.player1_name == "alnicozu"
+        assert matches[1].info.score == "6/3"
+
+    def test_concatenated_documents(
+        self, sample_match_html: str, sample_spanish_match_html: str
+    ) -> None:
+        """Test that a file of back-to-back full documents keeps every match."""
+        matches = parse_match_log_file(
+            sample_match_html + "<hr>" + sample_spanish_match_html
+        )
+
+        assert len(matches) == 2
+        assert matches[0].info.player2_name == "Rafael Nadal"
+        assert matches[1].info.player2_name == "Franky Franchicha"
+
+
+class TestProcessUploadedFile:
+    """Tests for uploaded file processing."""
+
+    async def test_file_with_matches(self, sample_match_html_bytes: bytes) -> None:
+        """Test that a match log upload yields matches."""
+        result = await process_uploaded_file(sample_match_html_bytes, "match.html")
+
+        assert result.success is True
+        assert result.matches
+
+    async def test_file_without_match_header(self) -> None:
+        """Test that files with no match separators are rejected early."""
+        html = b"<html><body><p>Not a match log</p><hr><table></table></body></html>"
+        result = await process_uploaded_file(html, "empty.html")
+
+        assert result.success is False
+        assert result.error == "Failed to parse any matches from file"
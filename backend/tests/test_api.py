@@ -76,11 +76,11 @@ class TestMatchAnalysisEndpoints:
 
         assert response.status_code == 400
 
-    def test_upload_valid_html(self, client: TestClient, sample_match_html: str) -> None:
+    def test_upload_valid_html(self, client: TestClient, sample_match_html_bytes: bytes) -> None:
         """Test uploading a valid HTML file."""
         response = client.post(
             "/api/analysis/upload",
-            files={"file": ("match.html", sample_match_html.encode(), "text/html")},
+            files={"file": ("match.html", sample_match_html_bytes, "text/html")},
         )
 
         assert response.status_code == 200
@@ -1,59 +1,67 @@
 """Tests for the parser service."""
 
+import pytest
+from pydantic import ValidationError
 
-from app.models.game_server import PlayerConfig
+from app.models.game_server import ControlMode, PlayerConfig, SkillMode
 from app.services.parser import (
     parse_game_info_bitfield,
+    parse_server_data,
     parse_server_entry,
     tokenize_server_line,
 )
 
 
-class TestParseGameInfoBitfield:
-    """Tests for GameInfo bitfield parsing."""
-
-    def test_parse_singles_mode(self) -> None:
-        """Test parsing a singles game configuration."""
-        # Value with PlayerConfig = 0 (Singles)
-        value = 0x00000000
-        result = parse_game_info_bitfield(value)
+def _game_info(**overrides: object) -> dict[str, object]:
+    """Expected GameInfo fields for an all-zero bitfield, with overrides."""
+    fields: dict[str, object] = {
+        "trial": 0,
+        "player_config": PlayerConfig.SINGLES,
+        "nb_set": 0,
+        "skill_mode": SkillMode.BEGINNER,
+        "games_per_set": 0,
+        "control_mode": ControlMode.KEYBOARD,
+        "preview": 0,
+        "tiredness": False,
+    }
+    fields.update(overrides)
+    return fields
 
-        assert result.player_config == PlayerConfig.SINGLES
-        assert result.trial == 0
 
-    def test_parse_doubles_mode(self) -> None:
-        """Test parsing a doubles game configuration."""
-        # PlayerConfig = 2 at bits 2-4 means Competitive Doubles
-        value = 0x00000008  # Binary: 1000, bits 2-4 = 010 = 2
-        result = parse_game_info_bitfield(value)
-
-        assert result.player_config == PlayerConfig.COMPETITIVE_DOUBLES
+class TestParseGameInfoBitfield:
+    """Tests for GameInfo bitfield parsing."""
 
-    def test_parse_full_bitfield(self) -> None:
-        """Test parsing a complete bitfield value."""
-        # 0x1B198E41 from sample data
-        value = 0x1B198E41
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            # Singles: PlayerConfig = 0
+            (0x00000000, _game_info()),
+            # PlayerConfig = 2 at bits 2-4 means Competitive Doubles
+            (0x00000008, _game_info(player_config=PlayerConfig.COMPETITIVE_DOUBLES)),
+            # Full value from sample data
+            (
+                0x1B198E41,
+                _game_info(trial=1, nb_set=2, games_per_set=6, preview=3, tiredness=True),
+            ),
+            # Bit 27 set: tiredness
+            (0x08000000, _game_info(tiredness=True)),
+        ],
+        ids=["singles", "doubles", "full", "tiredness"],
+    )
+    def test_parse_bitfield(self, value: int, expected: dict[str, object]) -> None:
+        """Test each GameInfo field decoded from a bitfield value."""
         result = parse_game_info_bitfield(value)
 
-        # Verify structure is returned
-        assert hasattr(result, "player_config")
-        assert hasattr(result, "nb_set")
-        assert hasattr(result, "skill_mode")
-        assert hasattr(result, "tiredness")
-
-    def test_parse_tiredness_flag(self) -> None:
-        """Test parsing the tiredness bit."""
-        # Bit 27 set
-        value = 0x08000000
-        result = parse_game_info_bitfield(value)
+        assert result.model_dump(include=set(expected)) == expected
 
-        assert result.tiredness is True
+    def test_cached_result_is_immutable(self) -> None:
+        """Test that the shared cached GameInfo cannot be modified."""
+        result = parse_game_info_bitfield(0x00000040)
 
-        # Bit 27 clear
-        value = 0x00000000
-        result = parse_game_info_bitfield(value)
+        with pytest.raises(ValidationError):
+            result.nb_set = 3
 
-        assert result.tiredness is False
+        assert parse_game_info_bitfield(0x00000040).nb_set == 2
 
 
 class TestTokenizeServerLine:
@@ -116,3 +124,39 @@ class TestParseServerEntry:
 
         if result:
             assert result.port == 0x1F90  # 8080 in decimal
+
+    def test_normalized_player_names(self) -> None:
+        """Test cached normalized player set used for rename detection."""
+        tokens = tokenize_server_line(
+            '0 1F90 "Alice vs Waiting" 0 0 0 0 "" "" 0 0 0 "" 0'
+        )
+        result = parse_server_entry(tokens)
+
+        assert result is not None
+        assert result.norm_players == frozenset({"alice", "waiting"})
+        assert result.is_waiting is True
+
+    def test_tournament_display_strips_code(self) -> None:
+        """Test removal of the numeric tournament code prefix."""
+        tokens = tokenize_server_line(
+            '0 1F90 "Test" 0 0 0 0 "" "" 0 0 0 "0010 AO Rod Laver Night" 0'
+        )
+        result = parse_server_entry(tokens)
+
+        assert result is not None
+        assert result.tournament_display == "AO Rod Laver Night"
+
+
+class TestParseServerData:
+    """Tests for splitting raw server data into entries."""
+
+    def test_splits_consecutive_entries(self, sample_server_data: str) -> None:
+        """Test that each IP/0/* token after a full entry starts a new one."""
+        waiting = '81.12.3.4 1F90 "Waiting" 0 0 0 0 "" "" 0 0 0 "Clay" 0'
+        raw = f"{sample_server_data} {waiting} * 1F90 \"Next\" 0 0 0 0 \"\" \"\" 0 0 0 \"\" 0"
+
+        servers = list(parse_server_data(raw))
+
+        assert [s.match_name for s in servers] == ["RBI vs TestPlayer", "Waiting", "Next"]
+        assert servers[1].ip == "81.12.3.4"
+        assert servers[1].is_started is False
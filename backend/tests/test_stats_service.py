@@ -0,0 +1,237 @@
+# backend/tests/test_stats_service.py
+"""Unit tests for stats service helpers."""
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models.daily_stats import DailyStats
+from app.models.finished_match import FinishedMatch
+from app.models.player_alias import PlayerAlias
+from app.services import stats_service as stats_module
+from app.services.parser import parse_server_entry
+from app.services.stats_service import StatsService, count_games
+
+
+def _server(
+    tag_line: str, game_info: str = "41", match_name: str = "A vs B", nb_game: str = "6"
+):
+    return parse_server_entry(
+        ["0", "1F90", match_name, game_info, "0", "0", nb_game, tag_line, "6/4", "0", "0", "0", "", "1"]
+    )
+
+
+@pytest.fixture
+async def session_factory(monkeypatch):
+    """In-memory SQLite database wired into the stats service."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(stats_module, "get_session_factory", lambda: factory)
+    yield factory
+    await engine.dispose()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable wall clock and monotonic time for the stats service."""
+    state = SimpleNamespace(now=None, monotonic=1000.0)
+
+    class FakeDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return state.now
+
+    monkeypatch.setattr(stats_module, "datetime", FakeDatetime)
+    monkeypatch.setattr(stats_module, "time", SimpleNamespace(monotonic=lambda: state.monotonic))
+    return state
+
+
+async def _counted_ids(factory) -> list[str]:
+    async with factory() as session:
+        result = await session.execute(select(FinishedMatch.match_id))
+        return sorted(result.scalars().all())
+
+
+class TestCountGames:
+    def test_straight_sets(self):
+        assert count_games("6/4 6/3") == 19
+
+    def test_tiebreak_notation(self):
+        assert count_games("7/6(3) 6/4") == 23
+
+    def test_ignores_non_set_tokens(self):
+        assert count_games("6/4 ret.") == 10
+
+    def test_empty(self):
+        assert count_games("") == 0
+        assert count_games(None) == 0
+
+
+class TestDetectMod:
+    def test_wtsl_takes_priority_over_xkt(self):
+        assert StatsService()._detect_mod(_server("XKT(WTSL)")) == "wtsl"
+
+    def test_xkt(self):
+        assert StatsService()._detect_mod(_server("XKT v4.2d")) == "xkt"
+
+    def test_vanilla(self):
+        assert StatsService()._detect_mod(_server("")) == "vanilla"
+
+
+class TestDetectFormat:
+    def test_formats_by_set_count(self):
+        service = StatsService()
+        # nb_set lives in bits 5-6 of GameInfo
+        formats = [service._detect_format(_server("", format(n << 5, "X"))) for n in range(4)]
+        assert formats == ["bo1", "bo1", "bo3", "bo5"]
+
+
+class TestFinishedMatchWriter:
+    async def test_enqueued_matches_written_in_one_batch(self, session_factory):
+        service = StatsService()
+        servers = [_server("XKT", match_name=f"P{i} vs Q{i}") for i in range(3)]
+        for server in servers:
+            service._enqueue_finished_match(server, "6/4", date(2024, 1, 15))
+        await service.save_to_db()
+
+        assert await _counted_ids(session_factory) == sorted(s.match_id for s in servers)
+        async with session_factory() as session:
+            stats = (await session.execute(select(DailyStats))).scalar_one()
+        assert stats.stats_date == date(2024, 1, 15)
+        assert stats.xkt_total == 3
+
+    async def test_duplicate_only_skips_that_match(self, session_factory):
+        service = StatsService()
+        first = _server("", match_name="A vs B")
+        second = _server("", match_name="C vs D")
+        await service._write_finished_matches([(first, "6/4", date(2024, 1, 15))])
+
+        # Another worker already counted `first`; its savepoint rolls back alone
+        await service._write_finished_matches(
+            [(first, "6/4", date(2024, 1, 15)), (second, "6/4", date(2024, 1, 15))]
+        )
+
+        assert await _counted_ids(session_factory) == sorted([first.match_id, second.match_id])
+        async with session_factory() as session:
+            stats = (await session.execute(select(DailyStats))).scalar_one()
+        assert stats.vanilla_total == 2
+
+    async def test_save_to_db_drains_queue_and_stops_writer(self, session_factory):
+        service = StatsService()
+        server = _server("WTSL")
+        service._enqueue_finished_match(server, "6/4", date(2024, 1, 15))
+        task = service._writer_task
+
+        await service.save_to_db()
+
+        assert await _counted_ids(session_factory) == [server.match_id]
+        assert task.cancelled()
+        assert service._writer_task is None
+
+    async def test_failed_batch_forgets_queued_ids(self, session_factory, monkeypatch):
+        service = StatsService()
+        server = _server("")
+        service._queued_match_ids.add(server.match_id)
+
+        async def fail(batch):
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(service, "_write_finished_matches", fail)
+        service._enqueue_finished_match(server, "6/4", date(2024, 1, 15))
+        await service.save_to_db()
+
+        assert server.match_id not in service._queued_match_ids
+
+
+class TestTrackMatches:
+    async def test_unchanged_match_set_refreshes_snapshots(self, session_factory):
+        service = StatsService()
+        assert await service.track_matches([_server("", nb_game="2")]) == 0
+
+        # Same match ID, more games played: fast path, nothing finishes
+        assert await service.track_matches([_server("", nb_game="6")]) == 0
+
+        # The finished match is judged on the latest snapshot, not the first one
+        assert await service.track_matches([]) == 1
+        await service.save_to_db()
+
+    async def test_queued_ids_reset_at_midnight(self, session_factory, clock):
+        service = StatsService()
+        server = _server("")
+        clock.now = datetime(2024, 1, 15, 23, 59, 0, tzinfo=service.timezone)
+
+        await service.track_matches([server])
+        assert await service.track_matches([]) == 1
+        assert service._queued_match_ids == {server.match_id}
+
+        # Same ID finishing again the same day is skipped
+        await service.track_matches([server])
+        assert await service.track_matches([]) == 0
+
+        clock.now = datetime(2024, 1, 16, 0, 0, 1, tzinfo=service.timezone)
+        clock.monotonic += service.TODAY_CACHE_SECONDS
+        await service.track_matches([server])
+        assert service._queued_match_ids == set()
+        assert service._queued_date == date(2024, 1, 16)
+        assert await service.track_matches([]) == 1
+        await service.save_to_db()
+
+
+class TestGetToday:
+    def test_cached_between_clock_reads(self, clock):
+        service = StatsService()
+        clock.now = datetime(2024, 1, 15, 12, 0, tzinfo=service.timezone)
+        assert service._get_today() == date(2024, 1, 15)
+
+        # Within TODAY_CACHE_SECONDS the clock is not consulted again
+        clock.now = datetime(2024, 1, 16, 12, 0, tzinfo=service.timezone)
+        clock.monotonic += service.TODAY_CACHE_SECONDS - 1
+        assert service._get_today() == date(2024, 1, 15)
+
+    def test_cache_never_outlives_midnight(self, clock):
+        service = StatsService()
+        clock.now = datetime(2024, 1, 15, 23, 59, 50, tzinfo=service.timezone)
+        assert service._get_today() == date(2024, 1, 15)
+
+        clock.now = datetime(2024, 1, 16, 0, 0, 0, tzinfo=service.timezone)
+        clock.monotonic += 10
+        assert service._get_today() == date(2024, 1, 16)
+
+
+
+class TestPlayerRollups:
+    async def test_aliases_resolved_while_streaming(self, session_factory):
+        async with session_factory() as session, session.begin():
+            session.add(PlayerAlias(alias="rf", canonical_name="Federer"))
+            session.add(
+                FinishedMatch(
+                    match_id="m_1", date=date(2024, 1, 15), match_name="RF vs Nadal", score="6/4"
+                )
+            )
+
+        players = await StatsService().get_all_players_async()
+
+        assert sorted(p["name"] for p in players) == ["Federer", "Nadal"]
+
+    async def test_missing_alias_table_still_lists_players(self, session_factory):
+        async with session_factory() as session, session.begin():
+            session.add(
+                FinishedMatch(
+                    match_id="m_1", date=date(2024, 1, 15), match_name="RF vs Nadal", score="6/4"
+                )
+            )
+            await session.execute(text("DROP TABLE player_aliases"))
+
+        players = await StatsService().get_all_players_async()
+
+        assert sorted(p["name"] for p in players) == ["Nadal", "RF"]